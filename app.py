@@ -3,21 +3,63 @@ Staff Directory Web Application
 Built with Streamlit and DeepFace
 """
 
+import asyncio
+import numpy as np
+import pandas as pd
 import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-import uuid
+import os
+import re
+import secrets
+import time
+from typing import Optional
 
 # Import utility functions
-from utils.deepface_helper import extract_embedding
+from utils.deepface_helper import (
+    DEFAULT_DETECTOR,
+    DETECTOR_BACKENDS,
+    build_detector,
+    build_recognition_model,
+    cosine_similarity,
+    extract_embedding,
+    preload_models,
+)
 from utils.image_utils import (
-    save_uploaded_file,
+    decode_and_downscale,
+    load_uploaded_image,
     display_image_with_info,
 )
-from utils.pinecone_helper import initialize_pinecone_from_env
+from utils.local_index import LocalIndex, initialize_local_index_from_env
+from utils.pinecone_helper import UPSERT_BATCH_SIZE, initialize_pinecone_from_env, rerank_matches
 
 # Fixed model — ArcFace (best accuracy, 512-dim embeddings)
 MODEL_NAME = "ArcFace"
 
+# Similarity above which a new registration is treated as an existing person
+DUPLICATE_THRESHOLD = 0.85
+
+# Candidates fetched per requested result before exact reranking
+RERANK_OVERSAMPLE = 4
+
+# Staff directory listing is reused for this many seconds before refetching
+STAFF_CACHE_TTL = 30
+STAFF_PAGE_SIZE = 20
+
+# Stylesheet injected on every run
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
+
+
+@st.cache_data(show_spinner=False)
+def _load_css(path: str) -> str:
+    """Read a stylesheet once per process, minified to cut the per-rerun payload."""
+    with open(path, encoding="utf-8") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{}:;,>])\s*", r"\1", css).strip()
+
+
 # Page configuration
 st.set_page_config(
     page_title="Staff Directory",
@@ -27,59 +69,72 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1rem 0;
-    }
-    .staff-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-    }
-    .staff-card h3 {
-        margin: 0 0 0.5rem 0;
-        word-break: break-word;
-    }
-    .staff-card p {
-        margin: 0;
-    }
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        text-align: center;
-    }
-
-    /* Mobile responsive */
-    @media (max-width: 768px) {
-        .main-header {
-            font-size: 1.8rem;
-            padding: 0.5rem 0;
-        }
-        .staff-card {
-            padding: 1rem;
-        }
-        /* Make Streamlit buttons easier to tap */
-        .stButton > button {
-            min-height: 44px;
-            width: 100%;
-        }
-        /* Full-width file uploader on mobile */
-        .stFileUploader {
-            width: 100%;
-        }
-    }
-    </style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_load_css(CSS_PATH)}</style>", unsafe_allow_html=True)
+
+
+@st.cache_resource(show_spinner="Loading face recognition model...")
+def _get_recognition_model(model_name: str):
+    """Build the recognition model once per process so it stays resident across reruns."""
+    return build_recognition_model(model_name)
+
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for network calls that can overlap with inference."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+@st.cache_resource(show_spinner="Loading face detector...")
+def _get_detector(detector_backend: str):
+    """Build the face detector once per process so it stays resident across reruns."""
+    return build_detector(detector_backend)
+
+
+@st.cache_resource
+def _get_local_index() -> Optional[LocalIndex]:
+    """Open the on-disk local index once per process so all sessions share it."""
+    try:
+        return initialize_local_index_from_env()
+    except Exception:
+        return None
+
+
+@st.cache_resource(show_spinner="Connecting to the database...")
+def _get_database():
+    """
+    Connect to Pinecone once per process so all sessions share one client.
+
+    Falls back to the local index when no Pinecone credentials are set.
+    Connection errors are not cached, so a later session retries.
+    """
+    helper = initialize_pinecone_from_env()
+    if helper is None:
+        return _get_local_index()
+    return helper
+
+
+@st.cache_resource
+def _start_model_preload() -> Future:
+    """Start loading the model and default detector in the background once per process."""
+    return _get_executor().submit(preload_models, MODEL_NAME, DEFAULT_DETECTOR)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_embedding(image_bytes: bytes, model_name: str, detector_backend: str, _image: np.ndarray):
+    """
+    Extract a face embedding, memoized on the image content, model and detector.
+
+    The already decoded image is passed in as _image (excluded from the cache
+    key) so the upload is not decoded a second time. The embedding is cached
+    as float16 to halve its footprint; callers upcast to float32 before
+    sending it anywhere.
+    """
+    embedding, facial_area = extract_embedding(
+        _image,
+        model_name=model_name,
+        detector_backend=detector_backend
+    )
+    return np.asarray(embedding, dtype=np.float16), facial_area
 
 
 def initialize_session_state():
@@ -88,6 +143,53 @@ def initialize_session_state():
         st.session_state.pinecone_helper = None
     if 'pinecone_initialized' not in st.session_state:
         st.session_state.pinecone_initialized = False
+    if 'pending_registrations' not in st.session_state:
+        st.session_state.pending_registrations = []
+
+
+def format_registered_at(metadata: dict) -> str:
+    """Format the registration time stored in an entry's metadata for display."""
+    timestamp = metadata.get('registered_at_ts')
+    if timestamp is None:
+        # Entries registered before epoch timestamps were stored as ISO strings
+        return metadata.get('registered_at', 'N/A')
+    return datetime.fromtimestamp(timestamp).isoformat(sep=" ", timespec="seconds")
+
+
+def flush_pending_registrations() -> int:
+    """Upsert all queued registrations in batches and clear the queue."""
+    pending = st.session_state.pending_registrations
+    if not pending:
+        return 0
+    vectors = [
+        {
+            "id": item["id"],
+            "values": item["embedding"],
+            "metadata": item["metadata"],
+        }
+        for item in pending
+    ]
+    count = st.session_state.pinecone_helper.register_faces_batch(vectors)
+    st.session_state.pending_registrations = []
+    invalidate_staff_cache()
+    return count
+
+
+def get_staff_entries() -> list:
+    """Return the staff directory listing, refetching it once the cache expires."""
+    cache = st.session_state.get('_staff_cache')
+    if cache is None or time.time() - cache['fetched_at'] > STAFF_CACHE_TTL:
+        cache = {
+            'entries': st.session_state.pinecone_helper.list_all_faces(),
+            'fetched_at': time.time(),
+        }
+        st.session_state['_staff_cache'] = cache
+    return cache['entries']
+
+
+def invalidate_staff_cache():
+    """Force the next directory render to refetch the listing."""
+    st.session_state.pop('_staff_cache', None)
 
 
 def render_header():
@@ -104,16 +206,30 @@ def render_sidebar():
 
         feature = st.radio(
             "Select Feature",
-            ["🏠 Home", "🔎 Find Staff", "➕ Register Staff", "📋 Staff Directory"],
+            ["🏠 Home", "🔎 Find Staff", "➕ Register Staff", "📥 Bulk Register", "📋 Staff Directory"],
             label_visibility="collapsed"
         )
 
         st.markdown("---")
 
+        st.markdown("### Settings")
+        st.selectbox(
+            "Face Detector",
+            DETECTOR_BACKENDS,
+            index=DETECTOR_BACKENDS.index(DEFAULT_DETECTOR),
+            key="detector_backend",
+            help="Backend used to locate faces before recognition."
+        )
+
+        st.markdown("---")
+
         # Pinecone status
         st.markdown("### Database Status")
         if st.session_state.pinecone_helper:
-            st.success("Connected")
+            if isinstance(st.session_state.pinecone_helper, LocalIndex):
+                st.info("Local index (offline)")
+            else:
+                st.success("Connected")
             try:
                 stats = st.session_state.pinecone_helper.get_stats()
                 st.metric("Registered Staff", stats['total_vectors'])
@@ -169,6 +285,7 @@ def render_home():
     st.info("👈 **Select a feature from the sidebar to get started!**")
 
 
+@st.fragment
 def render_find_staff():
     """Render the find staff feature."""
     st.markdown("## 🔎 Find Staff")
@@ -187,35 +304,52 @@ def render_find_staff():
         label_visibility="collapsed"
     )
 
-    img_path = None
+    image = None
 
     if input_method == "📁 Upload Image File":
-        uploaded_file = st.file_uploader("Upload Image", type=['jpg', 'jpeg', 'png'], key="search_img", label_visibility="collapsed")
-        if uploaded_file:
-            img_path = save_uploaded_file(uploaded_file)
+        image_file = st.file_uploader("Upload Image", type=['jpg', 'jpeg', 'png'], key="search_img", label_visibility="collapsed")
     else:
-        camera_photo = st.camera_input("Capture image", key="camera_search", label_visibility="collapsed")
-        if camera_photo:
-            img_path = save_uploaded_file(camera_photo)
+        image_file = st.camera_input("Capture image", key="camera_search", label_visibility="collapsed")
+
+    if image_file:
+        # Decoded once and shared by the preview and the embedding
+        image = load_uploaded_image(image_file)
+
+        # Warm up the database connection as soon as a new image is picked,
+        # so it is ready by the time the user clicks Find
+        if st.session_state.get('_warmup_file_id') != image_file.file_id:
+            st.session_state._warmup_file_id = image_file.file_id
+            st.session_state._warmup = _get_executor().submit(st.session_state.pinecone_helper.ping)
 
     with st.expander("Search Settings"):
         top_k = st.slider("Number of Results", 1, 10, 3)
         threshold = st.slider("Similarity Threshold", 0.0, 1.0, 0.7, 0.05)
-
-    if img_path:
+        department_filter = st.text_input(
+            "Department (optional)",
+            "",
+            placeholder="e.g. Engineering",
+            help="Only search staff registered with exactly this department."
+        ).strip()
+
+    if image is not None:
         st.markdown("### Uploaded Image")
-        display_image_with_info(img_path)
+        display_image_with_info(image)
 
         if st.button("🔍 Find This Person", type="primary"):
             with st.spinner("Searching..."):
                 try:
-                    embedding, _ = extract_embedding(img_path, model_name=MODEL_NAME)
+                    cached, _ = _cached_embedding(image_file.getvalue(), MODEL_NAME, st.session_state.detector_backend, image)
+                    embedding = cached.astype(np.float32)
+                    wait([st.session_state._warmup])
 
-                    matches = st.session_state.pinecone_helper.search_faces(
+                    candidates = st.session_state.pinecone_helper.search_faces(
                         query_embedding=embedding,
-                        top_k=top_k,
-                        score_threshold=threshold
+                        top_k=top_k * RERANK_OVERSAMPLE,
+                        score_threshold=threshold,
+                        metadata_filter={"department": {"$eq": department_filter}} if department_filter else None,
+                        include_values=True
                     )
+                    matches = rerank_matches(embedding, candidates, top_k)
 
                     st.markdown("---")
                     st.markdown("### Results")
@@ -248,6 +382,7 @@ def render_find_staff():
             st.info("Please capture a photo using the camera to search.")
 
 
+@st.fragment
 def render_register_staff():
     """Render the staff registration feature."""
     st.markdown("## ➕ Register Staff")
@@ -265,24 +400,24 @@ def render_register_staff():
         label_visibility="collapsed"
     )
 
-    img_path = None
+    image = None
 
     if input_method == "📁 Upload Image File":
-        uploaded_file = st.file_uploader("Upload Face Image", type=['jpg', 'jpeg', 'png'], key="register_img")
-        if uploaded_file:
-            img_path = save_uploaded_file(uploaded_file)
+        image_file = st.file_uploader("Upload Face Image", type=['jpg', 'jpeg', 'png'], key="register_img")
     else:
         st.caption("Click the camera button below to capture a photo")
-        camera_photo = st.camera_input("Take a picture", key="camera_register")
-        if camera_photo:
-            img_path = save_uploaded_file(camera_photo)
+        image_file = st.camera_input("Take a picture", key="camera_register")
+
+    if image_file:
+        # Decoded once and shared by the preview and the embedding
+        image = load_uploaded_image(image_file)
 
-    if img_path:
+    if image is not None:
         col1, col2 = st.columns([1, 1])
 
         with col1:
             st.markdown("### Photo")
-            display_image_with_info(img_path)
+            display_image_with_info(image)
 
         with col2:
             st.markdown("### Staff Information")
@@ -297,16 +432,27 @@ def render_register_staff():
                 else:
                     with st.spinner("Checking for duplicates..."):
                         try:
-                            embedding, _ = extract_embedding(img_path, model_name=MODEL_NAME)
-
-                            # Check if this face is already registered
-                            duplicates = st.session_state.pinecone_helper.search_faces(
+                            cached, _ = _cached_embedding(image_file.getvalue(), MODEL_NAME, st.session_state.detector_backend, image)
+                            embedding = cached.astype(np.float32)
+
+                            # Check if this face is already queued or registered
+                            queued = next(
+                                (item for item in st.session_state.pending_registrations
+                                 if cosine_similarity(item['embedding'], embedding) >= DUPLICATE_THRESHOLD),
+                                None
+                            )
+                            duplicates = [] if queued else st.session_state.pinecone_helper.search_faces(
                                 query_embedding=embedding,
                                 top_k=1,
-                                score_threshold=0.85
+                                score_threshold=DUPLICATE_THRESHOLD
                             )
 
-                            if duplicates:
+                            if queued:
+                                st.error(
+                                    f"This face is already queued for registration as "
+                                    f"**{queued['metadata']['name']}**."
+                                )
+                            elif duplicates:
                                 match = duplicates[0]
                                 meta = match['metadata']
                                 existing_name = meta.get('name', 'Unknown')
@@ -320,23 +466,27 @@ def render_register_staff():
                                     f"from **Staff Directory** first."
                                 )
                             else:
-                                face_id = f"staff_{uuid.uuid4().hex[:8]}"
+                                face_id = f"staff_{secrets.token_hex(4)}"
 
                                 metadata = {
                                     "name": person_name,
                                     "role": role,
                                     "department": department,
-                                    "registered_at": datetime.now().isoformat(),
+                                    "registered_at_ts": int(time.time()),
                                 }
 
-                                success = st.session_state.pinecone_helper.register_face(
-                                    embedding=embedding,
-                                    face_id=face_id,
-                                    metadata=metadata
-                                )
-
-                                if success:
-                                    st.success(f"Registered **{person_name}** successfully!")
+                                # Queued embeddings stay float16 (as cached) to keep session
+                                # state small; they are upcast when upserted
+                                st.session_state.pending_registrations.append({
+                                    "id": face_id,
+                                    "embedding": cached,
+                                    "metadata": metadata,
+                                })
+                                st.success(f"Queued **{person_name}** for registration.")
+
+                                if len(st.session_state.pending_registrations) >= UPSERT_BATCH_SIZE:
+                                    count = flush_pending_registrations()
+                                    st.success(f"Registered {count} staff member(s) successfully!")
                                     st.balloons()
 
                         except Exception as e:
@@ -347,7 +497,147 @@ def render_register_staff():
         else:
             st.info("Please capture a photo using the camera to register.")
 
+    pending = st.session_state.pending_registrations
+    if pending:
+        st.markdown("---")
+        st.markdown(f"### Pending Registrations ({len(pending)})")
+        st.caption("Queued staff are saved to the database together in one batch.")
+        for item in pending:
+            meta = item['metadata']
+            st.markdown(f"- **{meta['name']}** — {meta['role']}, {meta['department']}")
+
+        if st.button(f"💾 Save {len(pending)} Pending Registration(s)", type="primary"):
+            with st.spinner("Saving registrations..."):
+                try:
+                    count = flush_pending_registrations()
+                    st.success(f"Registered {count} staff member(s) successfully!")
+                    st.balloons()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+
+
+@st.fragment
+def render_bulk_register():
+    """Render the bulk registration feature."""
+    st.markdown("## 📥 Bulk Register")
+    st.markdown("Register several staff members at once from a set of photos, one face per photo.")
+
+    if not st.session_state.pinecone_helper:
+        st.warning("⚠️ Database is not configured. Please add your API key to the `.env` file and restart the app.")
+        return
+
+    image_files = st.file_uploader(
+        "Upload Face Images",
+        type=['jpg', 'jpeg', 'png'],
+        accept_multiple_files=True,
+        key="bulk_register_imgs"
+    )
 
+    if not image_files:
+        st.info("Please upload one or more photos to register.")
+        return
+
+    st.markdown("### Staff Information")
+    st.caption("Names are prefilled from the file names. All fields are required.")
+    table = st.data_editor(
+        pd.DataFrame({
+            "File": [f.name for f in image_files],
+            "Name": [os.path.splitext(f.name)[0].replace("_", " ") for f in image_files],
+            "Role": [""] * len(image_files),
+            "Department": [""] * len(image_files),
+        }),
+        disabled=["File"],
+        hide_index=True,
+        use_container_width=True,
+        key="bulk_register_table"
+    )
+
+    if st.button(f"➕ Register {len(image_files)} Staff Member(s)", type="primary"):
+        rows = table.to_dict("records")
+        incomplete = [
+            row["File"] for row in rows
+            if not all(str(row[field] or "").strip() for field in ("Name", "Role", "Department"))
+        ]
+        if incomplete:
+            st.warning(f"Please fill in all fields for: {', '.join(incomplete)}")
+            return
+
+        with st.spinner(f"Processing {len(image_files)} photo(s)..."):
+            # Decoding runs in parallel; detection is serialized inside
+            # deepface_helper, so embeddings are extracted in order here
+            executor = _get_executor()
+            futures = [executor.submit(decode_and_downscale, image_file.getvalue()) for image_file in image_files]
+
+            embedded, failed = [], []
+            for row, future in zip(rows, futures):
+                try:
+                    embedding, _ = extract_embedding(
+                        future.result(),
+                        model_name=MODEL_NAME,
+                        detector_backend=st.session_state.detector_backend
+                    )
+                    embedded.append((row, np.asarray(embedding, dtype=np.float32)))
+                except Exception as e:
+                    failed.append((row["File"], str(e)))
+
+            # Same duplicate checks as Register Staff, plus repeats within the upload
+            try:
+                existing = asyncio.run(st.session_state.pinecone_helper.search_faces_many(
+                    [embedding for _, embedding in embedded],
+                    top_k=1,
+                    score_threshold=DUPLICATE_THRESHOLD
+                ))
+            except Exception as e:
+                st.error(f"Failed to check for duplicates: {str(e)}")
+                return
+
+            vectors, duplicates = [], []
+            registered_at = int(time.time())
+            for (row, embedding), matches in zip(embedded, existing):
+                queued = next(
+                    (item['metadata']['name'] for item in st.session_state.pending_registrations
+                     if cosine_similarity(item['embedding'], embedding) >= DUPLICATE_THRESHOLD),
+                    None
+                )
+                repeated = next(
+                    (vector['metadata']['name'] for vector in vectors
+                     if cosine_similarity(vector['values'], embedding) >= DUPLICATE_THRESHOLD),
+                    None
+                )
+                if matches:
+                    existing_name = matches[0]['metadata'].get('name', 'Unknown')
+                    duplicates.append((row["File"], f"already registered as **{existing_name}**"))
+                elif queued:
+                    duplicates.append((row["File"], f"already queued for registration as **{queued}**"))
+                elif repeated:
+                    duplicates.append((row["File"], f"same person as **{repeated}** earlier in this upload"))
+                else:
+                    vectors.append({
+                        "id": f"staff_{secrets.token_hex(4)}",
+                        "values": embedding,
+                        "metadata": {
+                            "name": row["Name"].strip(),
+                            "role": row["Role"].strip(),
+                            "department": row["Department"].strip(),
+                            "registered_at_ts": registered_at,
+                        },
+                    })
+
+            try:
+                count = st.session_state.pinecone_helper.register_faces_batch(vectors)
+                invalidate_staff_cache()
+                if count:
+                    st.success(f"Registered {count} staff member(s) successfully!")
+            except Exception as e:
+                st.error(f"Failed to save registrations: {str(e)}")
+
+            for name, reason in duplicates:
+                st.warning(f"Skipped {name}: {reason}")
+            for name, error in failed:
+                st.error(f"{name}: {error}")
+
+
+@st.fragment
 def render_staff_directory():
     """Render the staff directory page."""
     st.markdown("## 📋 Staff Directory")
@@ -358,26 +648,37 @@ def render_staff_directory():
         return
 
     if st.button("🔄 Refresh"):
-        st.rerun()
+        invalidate_staff_cache()
+        st.rerun(scope="fragment")
 
     with st.spinner("Loading staff directory..."):
         try:
-            entries = st.session_state.pinecone_helper.list_all_faces()
+            entries = get_staff_entries()
 
             if not entries:
                 st.info("No staff members registered yet. Go to **Register Staff** to add someone.")
                 return
 
             st.markdown(f"**Total: {len(entries)} staff member(s)**")
+
+            # Only render one page of entries (and delete buttons) per rerun
+            page_count = (len(entries) + STAFF_PAGE_SIZE - 1) // STAFF_PAGE_SIZE
+            page = 1
+            if page_count > 1:
+                # Deletes can shrink the listing below the selected page
+                if st.session_state.get('staff_page', 1) > page_count:
+                    st.session_state.staff_page = page_count
+                page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key="staff_page")
+            start = (page - 1) * STAFF_PAGE_SIZE
             st.markdown("---")
 
-            for entry in entries:
+            for entry in entries[start:start + STAFF_PAGE_SIZE]:
                 meta = entry.get('metadata', {})
                 face_id = entry.get('id', '')
                 name = meta.get('name', 'Unknown')
                 role = meta.get('role', 'N/A')
                 department = meta.get('department', 'N/A')
-                registered_at = meta.get('registered_at', 'N/A')
+                registered_at = format_registered_at(meta)
 
                 with st.container():
                     st.markdown(
@@ -388,8 +689,12 @@ def render_staff_directory():
                     if st.button("🗑️ Delete", key=f"del_{face_id}"):
                         try:
                             st.session_state.pinecone_helper.delete_face(face_id)
+                            # Drop the entry from the cached listing instead of refetching
+                            st.session_state['_staff_cache']['entries'] = [
+                                e for e in entries if e.get('id') != face_id
+                            ]
                             st.success(f"Deleted {name}")
-                            st.rerun()
+                            st.rerun(scope="fragment")
                         except Exception as e:
                             st.error(f"Failed to delete: {str(e)}")
                     st.markdown("---")
@@ -401,26 +706,36 @@ def render_staff_directory():
 def main():
     """Main application entry point."""
     initialize_session_state()
+    preload = _start_model_preload()
 
-    # Try to initialize Pinecone
+    # Attach the shared database client; a failed connection is retried next session
     if not st.session_state.pinecone_initialized:
         try:
-            st.session_state.pinecone_helper = initialize_pinecone_from_env()
-            st.session_state.pinecone_initialized = True
+            st.session_state.pinecone_helper = _get_database()
         except Exception:
             st.session_state.pinecone_helper = None
-            st.session_state.pinecone_initialized = True
+        st.session_state.pinecone_initialized = True
 
     render_header()
 
     feature = render_sidebar()
 
+    # Only face features wait for the model; Home and the directory render immediately
+    if feature in ("🔎 Find Staff", "➕ Register Staff", "📥 Bulk Register"):
+        if not preload.done():
+            with st.spinner("Loading face recognition model..."):
+                wait([preload])
+        _get_recognition_model(MODEL_NAME)
+        _get_detector(st.session_state.detector_backend)
+
     if feature == "🏠 Home":
         render_home()
     elif feature == "🔎 Find Staff":
         render_find_staff()
     elif feature == "➕ Register Staff":
         render_register_staff()
+    elif feature == "📥 Bulk Register":
+        render_bulk_register()
     elif feature == "📋 Staff Directory":
         render_staff_directory()
 
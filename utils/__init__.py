@@ -7,12 +7,18 @@ from .deepface_helper import (
     analyze_face,
     extract_embedding,
     extract_embeddings,
+    extract_embeddings_batch,
     detect_faces,
-    get_available_models
+    get_available_models,
+    cosine_similarity,
+    verify_embeddings,
+    quantize_int8,
+    dequantize_int8
 )
 
 from .image_utils import (
     save_uploaded_file,
+    load_uploaded_image,
     display_image_with_info,
     cleanup_temp_files
 )
@@ -22,9 +28,15 @@ __all__ = [
     'analyze_face',
     'extract_embedding',
     'extract_embeddings',
+    'extract_embeddings_batch',
     'detect_faces',
     'get_available_models',
+    'cosine_similarity',
+    'verify_embeddings',
+    'quantize_int8',
+    'dequantize_int8',
     'save_uploaded_file',
+    'load_uploaded_image',
     'display_image_with_info',
     'cleanup_temp_files'
 ]
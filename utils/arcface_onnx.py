@@ -0,0 +1,162 @@
+"""
+ONNX Runtime backend for ArcFace inference.
+
+The Keras ArcFace model built by DeepFace is exported to ONNX once and
+then run with ONNX Runtime, which avoids TensorFlow's per-call overhead.
+Used automatically when onnxruntime is installed (plus tf2onnx for the
+one-time export); otherwise callers fall back to the Keras model.
+"""
+
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+# Where the exported model is stored (override with ARCFACE_ONNX_PATH)
+ONNX_MODEL_PATH = os.getenv(
+    "ARCFACE_ONNX_PATH",
+    os.path.join(tempfile.gettempdir(), "face_recognition_models", "arcface.onnx")
+)
+
+# Run an int8 weight-quantized copy of the model (set ARCFACE_ONNX_INT8=1).
+# Faster on CPU at a small accuracy cost, so it is opt-in.
+USE_INT8 = os.getenv("ARCFACE_ONNX_INT8", "").lower() in ("1", "true", "yes")
+
+# Execution providers in order of preference
+PREFERRED_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+_session = None
+_session_lock = threading.Lock()
+_disabled = False
+
+
+def is_available() -> bool:
+    """
+    Check whether the ONNX backend can be used.
+
+    Returns:
+        True if onnxruntime is installed, the model is exported or can be
+        exported, and the backend has not been disabled after a failure
+    """
+    if _disabled:
+        return False
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    if os.path.exists(ONNX_MODEL_PATH):
+        return True
+    try:
+        import tf2onnx  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def disable(reason: str) -> None:
+    """
+    Stop using the ONNX backend for the rest of the process.
+
+    Args:
+        reason: Why the backend is being disabled
+    """
+    global _disabled
+    _disabled = True
+    print(f"Warning: ONNX ArcFace backend disabled: {reason}")
+
+
+def export_model(keras_model, output_path: str = ONNX_MODEL_PATH) -> str:
+    """
+    Export a Keras ArcFace model to ONNX.
+
+    Args:
+        keras_model: Keras model from DeepFace's ArcFace client
+        output_path: Destination of the .onnx file
+
+    Returns:
+        Path to the exported model
+    """
+    import tensorflow as tf
+    import tf2onnx
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    input_signature = (
+        tf.TensorSpec((None, *keras_model.input_shape[1:]), tf.float32, name="input"),
+    )
+
+    # Export next to the destination, then move it into place atomically
+    partial_path = f"{output_path}.{os.getpid()}.part"
+    tf2onnx.convert.from_keras(
+        keras_model,
+        input_signature=input_signature,
+        opset=15,
+        output_path=partial_path
+    )
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def quantize_model(input_path: str = ONNX_MODEL_PATH) -> str:
+    """
+    Write an int8 weight-quantized copy of an exported model.
+
+    Args:
+        input_path: Path to the float32 .onnx model
+
+    Returns:
+        Path to the quantized model
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = os.path.splitext(input_path)[0] + "_int8.onnx"
+    partial_path = f"{output_path}.{os.getpid()}.part"
+    quantize_dynamic(input_path, partial_path, weight_type=QuantType.QInt8)
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def get_session(keras_model):
+    """
+    Get the shared ONNX Runtime session, exporting the model on first use.
+
+    Args:
+        keras_model: Keras model used for the export if no .onnx file exists
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import onnxruntime as ort
+
+            if not os.path.exists(ONNX_MODEL_PATH):
+                export_model(keras_model)
+
+            model_path = ONNX_MODEL_PATH
+            if USE_INT8:
+                model_path = os.path.splitext(ONNX_MODEL_PATH)[0] + "_int8.onnx"
+                if not os.path.exists(model_path):
+                    model_path = quantize_model(ONNX_MODEL_PATH)
+
+            available = ort.get_available_providers()
+            providers = [p for p in PREFERRED_PROVIDERS if p in available]
+            _session = ort.InferenceSession(model_path, providers=providers)
+        return _session
+
+
+def embed(keras_model, batch: np.ndarray) -> np.ndarray:
+    """
+    Run a batch of preprocessed face crops through ArcFace with ONNX Runtime.
+
+    Args:
+        keras_model: Keras ArcFace model (only used for the first export)
+        batch: Array of shape (N, 112, 112, 3)
+
+    Returns:
+        Embeddings of shape (N, 512)
+    """
+    session = get_session(keras_model)
+    input_name = session.get_inputs()[0].name
+    return session.run(None, {input_name: batch.astype(np.float32, copy=False)})[0]
@@ -2,8 +2,18 @@
 DeepFace helper functions for face recognition and analysis.
 """
 
-from typing import Dict, List, Optional, Tuple
-from deepface import DeepFace
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+
+from . import arcface_onnx
+
+# Silence TensorFlow's C++ logging before DeepFace imports it
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
 
 
 # Available models in DeepFace
@@ -19,12 +29,95 @@ AVAILABLE_MODELS = [
     "SFace",
 ]
 
+# Embedding dimensions for each model
+MODEL_DIMENSIONS = {
+    "VGG-Face": 2622,
+    "Facenet": 128,
+    "Facenet512": 512,
+    "OpenFace": 128,
+    "DeepFace": 4096,
+    "DeepID": 160,
+    "ArcFace": 512,
+    "Dlib": 128,
+    "SFace": 128,
+}
+
 # Default model (ArcFace has best performance according to benchmarks)
 DEFAULT_MODEL = "ArcFace"
 
+# Face detector backends that work with the base requirements
+# ("skip" treats the whole image as an already-cropped face)
+DETECTOR_BACKENDS = ["yunet", "opencv", "ssd", "skip"]
+
+# Default face detector (YuNet is a small ONNX CNN, much faster than Haar cascades)
+DEFAULT_DETECTOR = "yunet"
+
 # Available distance metrics
 DISTANCE_METRICS = ["cosine", "euclidean", "euclidean_l2"]
 
+# Cosine distance thresholds per model (same values DeepFace.verify uses)
+COSINE_THRESHOLDS = {
+    "VGG-Face": 0.68,
+    "Facenet": 0.40,
+    "Facenet512": 0.30,
+    "OpenFace": 0.10,
+    "DeepFace": 0.23,
+    "DeepID": 0.015,
+    "ArcFace": 0.68,
+    "Dlib": 0.07,
+    "SFace": 0.593,
+}
+
+
+# Number of embeddings kept by extract_embedding, least recently used evicted first
+EMBEDDING_CACHE_SIZE = 512
+
+_EMBEDDING_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[List[float], Dict]]" = OrderedDict()
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+# DeepFace shares one detector instance per backend and sets its input size
+# on every call (YuNet, SSD), so concurrent detections from different
+# sessions or threads can fail or return wrong boxes. Every DeepFace call
+# that runs a detector holds this lock.
+_DETECTION_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _deepface():
+    """
+    Import DeepFace on first use.
+    
+    DeepFace pulls in TensorFlow, which takes seconds to initialize, so it
+    is only loaded once a face feature actually needs it.
+    """
+    from deepface import DeepFace
+    return DeepFace
+
+
+def _image_digest(img_path: Union[str, np.ndarray]) -> str:
+    """Hash an image file's bytes or a decoded array's pixels."""
+    if isinstance(img_path, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(img_path).tobytes())
+        digest.update(repr((img_path.shape, img_path.dtype.str)).encode())
+        return digest.hexdigest()
+    with open(img_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _use_onnx(model_name: str) -> bool:
+    """Whether inference for this model should go through ONNX Runtime."""
+    return model_name == "ArcFace" and arcface_onnx.is_available()
+
+
+def _forward(model, model_name: str, batch: np.ndarray, batch_size: int) -> np.ndarray:
+    """Run preprocessed face crops through the model, via ONNX Runtime when possible."""
+    if _use_onnx(model_name):
+        try:
+            return arcface_onnx.embed(model.model, batch)
+        except Exception as e:
+            arcface_onnx.disable(str(e))
+    return model.model.predict(batch, batch_size=batch_size, verbose=0)
+
 
 def get_available_models() -> List[str]:
     """
@@ -36,19 +129,86 @@ def get_available_models() -> List[str]:
     return AVAILABLE_MODELS
 
 
+def build_recognition_model(model_name: str = DEFAULT_MODEL):
+    """
+    Build a face recognition model so its weights are loaded into memory.
+    
+    DeepFace keeps built models in an in-process cache keyed on the model
+    name, so later represent/verify calls reuse the loaded weights.
+    
+    Args:
+        model_name: Face recognition model to build
+        
+    Returns:
+        DeepFace model client
+    """
+    try:
+        return _deepface().build_model(model_name)
+    except Exception as e:
+        raise Exception(f"Model build failed: {str(e)}")
+
+
+def build_detector(detector_backend: str = DEFAULT_DETECTOR):
+    """
+    Build a face detector so it is initialized before the first detection.
+    
+    Like recognition models, DeepFace caches built detectors by name.
+    
+    Args:
+        detector_backend: Face detection backend
+        
+    Returns:
+        DeepFace detector client, or None for "skip"
+    """
+    if detector_backend == "skip":
+        return None
+    
+    try:
+        return _deepface().build_model(detector_backend, task="face_detector")
+    except Exception as e:
+        raise Exception(f"Detector build failed: {str(e)}")
+
+
+def preload_models(
+    model_name: str = DEFAULT_MODEL,
+    detector_backend: str = DEFAULT_DETECTOR
+) -> None:
+    """
+    Load the recognition model and face detector into DeepFace's cache.
+    
+    When inference goes through ONNX Runtime, the session is created too,
+    so the one-time tf2onnx export does not land on the first request.
+    
+    Args:
+        model_name: Face recognition model to load
+        detector_backend: Face detection backend to load
+    """
+    model = build_recognition_model(model_name)
+    if _use_onnx(model_name):
+        try:
+            arcface_onnx.get_session(model.model)
+        except Exception as e:
+            arcface_onnx.disable(str(e))
+    build_detector(detector_backend)
+
+
 def verify_faces(
-    img1_path: str,
-    img2_path: str,
+    img1_path: Union[str, np.ndarray],
+    img2_path: Union[str, np.ndarray],
     model_name: str = DEFAULT_MODEL,
     distance_metric: str = "cosine",
-    detector_backend: str = "opencv"
+    detector_backend: str = DEFAULT_DETECTOR
 ) -> Dict:
     """
     Verify if two faces belong to the same person.
     
+    With the cosine metric, both images go through the memoized
+    extract_embedding and are compared in-process against the
+    precomputed COSINE_THRESHOLDS; other metrics use DeepFace.verify.
+    
     Args:
-        img1_path: Path to first image
-        img2_path: Path to second image
+        img1_path: Path to first image or decoded BGR image array
+        img2_path: Path to second image or decoded BGR image array
         model_name: Face recognition model to use
         distance_metric: Distance metric for comparison
         detector_backend: Face detection backend
@@ -60,31 +220,134 @@ def verify_faces(
         - threshold: Threshold for verification
         - model: Model used
         - similarity_metric: Metric used
+        - facial_areas: Face regions in img1 and img2
     """
     try:
-        result = DeepFace.verify(
-            img1_path=img1_path,
-            img2_path=img2_path,
-            model_name=model_name,
-            distance_metric=distance_metric,
-            detector_backend=detector_backend,
-            enforce_detection=True
-        )
+        if distance_metric != "cosine":
+            with _DETECTION_LOCK:
+                return _deepface().verify(
+                    img1_path=img1_path,
+                    img2_path=img2_path,
+                    model_name=model_name,
+                    distance_metric=distance_metric,
+                    detector_backend=detector_backend,
+                    enforce_detection=True
+                )
+        
+        embedding1, facial_area1 = extract_embedding(img1_path, model_name, detector_backend)
+        embedding2, facial_area2 = extract_embedding(img2_path, model_name, detector_backend)
+        result = verify_embeddings(embedding1, embedding2, model_name)
+        result["facial_areas"] = {"img1": facial_area1, "img2": facial_area2}
         return result
     except Exception as e:
         raise Exception(f"Face verification failed: {str(e)}")
 
 
+def l2_normalize(embedding: np.ndarray) -> np.ndarray:
+    """
+    Scale an embedding to unit length.
+    
+    DeepFace already applies each model's own input normalization, so the
+    output side only needs L2 scaling; after it, cosine similarity between
+    embeddings is a plain dot product.
+    
+    Args:
+        embedding: Embedding vector
+        
+    Returns:
+        Unit-length float32 embedding
+    """
+    embedding = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(embedding))
+    return embedding / norm if norm > 0 else embedding
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Compute cosine similarity between two embedding vectors.
+    
+    Args:
+        a: First embedding
+        b: Second embedding
+        
+    Returns:
+        Cosine similarity in the range [-1, 1]
+    """
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    return float((a @ b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def quantize_int8(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Quantize an embedding to int8 with a symmetric per-vector scale.
+    
+    Args:
+        embedding: Float embedding vector
+        
+    Returns:
+        Tuple of (int8 codes, scale) where embedding ~= codes * scale
+    """
+    embedding = np.asarray(embedding, dtype=np.float32)
+    scale = float(np.max(np.abs(embedding))) / 127.0 or 1.0
+    codes = np.round(embedding / scale).astype(np.int8)
+    return codes, scale
+
+
+def dequantize_int8(codes: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Reconstruct a float32 embedding from int8 codes.
+    
+    Args:
+        codes: int8 codes produced by quantize_int8
+        scale: Scale produced by quantize_int8
+        
+    Returns:
+        Reconstructed float32 embedding
+    """
+    return codes.astype(np.float32) * scale
+
+
+def verify_embeddings(
+    embedding1: np.ndarray,
+    embedding2: np.ndarray,
+    model_name: str = DEFAULT_MODEL
+) -> Dict:
+    """
+    Verify if two precomputed embeddings belong to the same person.
+    
+    Cheap alternative to verify_faces when both embeddings are already
+    available, since no detection or inference is run.
+    
+    Args:
+        embedding1: Embedding of the first face
+        embedding2: Embedding of the second face
+        model_name: Model that produced the embeddings
+        
+    Returns:
+        Dictionary with the same keys as verify_faces
+    """
+    distance = 1.0 - cosine_similarity(embedding1, embedding2)
+    threshold = COSINE_THRESHOLDS[model_name]
+    return {
+        "verified": distance <= threshold,
+        "distance": distance,
+        "threshold": threshold,
+        "model": model_name,
+        "similarity_metric": "cosine"
+    }
+
+
 def analyze_face(
-    img_path: str,
+    img_path: Union[str, np.ndarray],
     actions: Optional[List[str]] = None,
-    detector_backend: str = "opencv"
+    detector_backend: str = DEFAULT_DETECTOR
 ) -> List[Dict]:
     """
     Analyze facial attributes including age, gender, emotion, and race.
     
     Args:
-        img_path: Path to image
+        img_path: Path to image or decoded BGR image array
         actions: List of analysis actions (age, gender, emotion, race)
         detector_backend: Face detection backend
         
@@ -95,79 +358,104 @@ def analyze_face(
         actions = ['age', 'gender', 'race', 'emotion']
     
     try:
-        results = DeepFace.analyze(
-            img_path=img_path,
-            actions=actions,
-            detector_backend=detector_backend,
-            enforce_detection=True
-        )
+        with _DETECTION_LOCK:
+            results = _deepface().analyze(
+                img_path=img_path,
+                actions=actions,
+                detector_backend=detector_backend,
+                enforce_detection=True
+            )
         return results
     except Exception as e:
         raise Exception(f"Face analysis failed: {str(e)}")
 
 
 def extract_embedding(
-    img_path: str,
+    img_path: Union[str, np.ndarray],
     model_name: str = DEFAULT_MODEL,
-    detector_backend: str = "opencv"
+    detector_backend: str = DEFAULT_DETECTOR
 ) -> Tuple[List[float], Dict]:
     """
     Extract face embedding vector from an image.
     
+    Only the largest detected face is embedded; use extract_embeddings
+    to embed every face in the image. Results are memoized on a hash of
+    the image content, so repeat calls on the same image skip inference.
+    
     Args:
-        img_path: Path to image
+        img_path: Path to image or decoded BGR image array
         model_name: Face recognition model to use
         detector_backend: Face detection backend
         
     Returns:
-        Tuple of (embedding vector, face metadata)
+        Tuple of (L2-normalized embedding vector, face metadata)
     """
     try:
-        result = DeepFace.represent(
-            img_path=img_path,
-            model_name=model_name,
-            detector_backend=detector_backend,
-            enforce_detection=True
-        )
-        
-        # DeepFace returns a list of results for each face detected
-        if result and len(result) > 0:
-            embedding = result[0]["embedding"]
-            facial_area = result[0]["facial_area"]
-            return embedding, facial_area
+        key = (_image_digest(img_path), model_name, detector_backend)
+        with _EMBEDDING_CACHE_LOCK:
+            cached = _EMBEDDING_CACHE.get(key)
+            if cached is not None:
+                _EMBEDDING_CACHE.move_to_end(key)
+        if cached is not None:
+            return list(cached[0]), dict(cached[1])
+        
+        if _use_onnx(model_name):
+            # DeepFace only detects and aligns; ONNX Runtime runs the model
+            embedding, facial_area = extract_embeddings_batch([img_path], model_name, detector_backend)[0]
         else:
-            raise Exception("No faces detected in the image")
+            with _DETECTION_LOCK:
+                result = _deepface().represent(
+                    img_path=img_path,
+                    model_name=model_name,
+                    detector_backend=detector_backend,
+                    enforce_detection=True,
+                    max_faces=1
+                )
+            
+            # DeepFace returns a list of results for each face detected
+            if result and len(result) > 0:
+                embedding = l2_normalize(result[0]["embedding"]).tolist()
+                facial_area = result[0]["facial_area"]
+            else:
+                raise Exception("No faces detected in the image")
+        
+        with _EMBEDDING_CACHE_LOCK:
+            _EMBEDDING_CACHE[key] = (embedding, facial_area)
+            if len(_EMBEDDING_CACHE) > EMBEDDING_CACHE_SIZE:
+                _EMBEDDING_CACHE.popitem(last=False)
+        return list(embedding), dict(facial_area)
             
     except Exception as e:
         raise Exception(f"Embedding extraction failed: {str(e)}")
 
 
 def extract_embeddings(
-    img_path: str,
+    img_path: Union[str, np.ndarray],
     model_name: str = DEFAULT_MODEL,
-    detector_backend: str = "opencv"
+    detector_backend: str = DEFAULT_DETECTOR
 ) -> List[Dict]:
     """
     Extract embeddings for all detected faces from an image.
 
     Args:
-        img_path: Path to image
+        img_path: Path to image or decoded BGR image array
         model_name: Face recognition model to use
         detector_backend: Face detection backend
 
     Returns:
         List of dictionaries with:
         - face_index: Stable index for face selection in UI
-        - embedding: Face embedding vector
+        - embedding: L2-normalized face embedding vector
         - facial_area: Bounding box details
     """
     try:
-        results = DeepFace.represent(
-            img_path=img_path,
-            model_name=model_name,
-            detector_backend=detector_backend,
-            enforce_detection=True
-        )
+        with _DETECTION_LOCK:
+            results = _deepface().represent(
+                img_path=img_path,
+                model_name=model_name,
+                detector_backend=detector_backend,
+                enforce_detection=True
+            )
 
         if not results:
             raise Exception("No faces detected in the image")
@@ -176,7 +464,7 @@ def extract_embeddings(
         for idx, face_result in enumerate(results):
             embeddings.append({
                 "face_index": idx,
-                "embedding": face_result.get("embedding"),
+                "embedding": l2_normalize(face_result.get("embedding")).tolist(),
                 "facial_area": face_result.get("facial_area", {})
             })
 
@@ -186,16 +474,77 @@ def extract_embeddings(
         raise Exception(f"Multi-face embedding extraction failed: {str(e)}")
 
 
+def extract_embeddings_batch(
+    img_paths: List[Union[str, np.ndarray]],
+    model_name: str = DEFAULT_MODEL,
+    detector_backend: str = DEFAULT_DETECTOR,
+    batch_size: int = 32
+) -> List[Tuple[List[float], Dict]]:
+    """
+    Extract the largest face's embedding from each of several images.
+    
+    Faces are detected and aligned per image, then embedded together in
+    batched forward passes instead of one model call per image. The
+    preprocessing mirrors DeepFace.represent, so embeddings match
+    extract_embedding.
+    
+    Args:
+        img_paths: Paths to images or decoded BGR image arrays
+        model_name: Face recognition model to use
+        detector_backend: Face detection backend
+        batch_size: Number of faces per forward pass
+        
+    Returns:
+        List of (L2-normalized embedding vector, face metadata) tuples,
+        in the same order as img_paths
+    """
+    if not img_paths:
+        return []
+    
+    try:
+        from deepface.modules import preprocessing
+        
+        model = build_recognition_model(model_name)
+        target_size = model.input_shape
+        
+        crops = []
+        facial_areas = []
+        for img_path in img_paths:
+            with _DETECTION_LOCK:
+                faces = _deepface().extract_faces(
+                    img_path=img_path,
+                    detector_backend=detector_backend,
+                    enforce_detection=True,
+                    align=True
+                )
+            face = max(faces, key=lambda f: f["facial_area"]["w"] * f["facial_area"]["h"])
+            
+            # Same channel order, resize and normalization as DeepFace.represent
+            img = face["face"][:, :, ::-1]
+            img = preprocessing.resize_image(img=img, target_size=(target_size[1], target_size[0]))
+            crops.append(preprocessing.normalize_input(img=img, normalization="base"))
+            facial_areas.append(face["facial_area"])
+        
+        embeddings = _forward(model, model_name, np.concatenate(crops), batch_size)
+        return [
+            (l2_normalize(embedding).tolist(), facial_area)
+            for embedding, facial_area in zip(embeddings, facial_areas)
+        ]
+        
+    except Exception as e:
+        raise Exception(f"Batch embedding extraction failed: {str(e)}")
+
+
 def detect_faces(
-    img_path: str,
-    detector_backend: str = "opencv",
+    img_path: Union[str, np.ndarray],
+    detector_backend: str = DEFAULT_DETECTOR,
     align: bool = True
 ) -> List[Dict]:
     """
     Detect and extract faces from an image.
     
     Args:
-        img_path: Path to image
+        img_path: Path to image or decoded BGR image array
         detector_backend: Face detection backend
         align: Whether to align faces
         
@@ -203,12 +552,13 @@ def detect_faces(
         List of dictionaries with face data and metadata
     """
     try:
-        faces = DeepFace.extract_faces(
-            img_path=img_path,
-            detector_backend=detector_backend,
-            align=align,
-            enforce_detection=True
-        )
+        with _DETECTION_LOCK:
+            faces = _deepface().extract_faces(
+                img_path=img_path,
+                detector_backend=detector_backend,
+                align=align,
+                enforce_detection=True
+            )
         return faces
     except Exception as e:
         raise Exception(f"Face detection failed: {str(e)}")
@@ -224,20 +574,7 @@ def get_model_info(model_name: str) -> Dict[str, any]:
     Returns:
         Dictionary with model information including embedding dimension
     """
-    # Embedding dimensions for each model
-    model_dimensions = {
-        "VGG-Face": 2622,
-        "Facenet": 128,
-        "Facenet512": 512,
-        "OpenFace": 128,
-        "DeepFace": 4096,
-        "DeepID": 160,
-        "ArcFace": 512,
-        "Dlib": 128,
-        "SFace": 128,
-    }
-    
     return {
         "name": model_name,
-        "embedding_dimension": model_dimensions.get(model_name, "Unknown")
+        "embedding_dimension": MODEL_DIMENSIONS.get(model_name, "Unknown")
     }
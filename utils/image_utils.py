@@ -2,11 +2,17 @@
 Image utility functions for Streamlit application.
 """
 
+import hashlib
+import io
 import os
 import tempfile
+import time
+from operator import itemgetter
+import cv2
+import numpy as np
 import streamlit as st
 from PIL import Image
-from typing import Optional
+from typing import Optional, Union
 import shutil
 
 
@@ -14,11 +20,24 @@ import shutil
 TEMP_DIR = os.path.join(tempfile.gettempdir(), "face_recognition_temp")
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# Chunk size used when streaming uploads to disk
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Uploads are downscaled so their longest edge is at most this many pixels
+MAX_IMAGE_EDGE = 640
+
+# Images sent to the browser are bounded to this edge and JPEG quality
+DISPLAY_MAX_EDGE = 800
+DISPLAY_JPEG_QUALITY = 82
+
 
 def save_uploaded_file(uploaded_file) -> str:
     """
     Save a Streamlit uploaded file to temporary storage.
     
+    Files are named after a hash of their content, so identical uploads
+    map to the same path and are only written once.
+    
     Args:
         uploaded_file: Streamlit UploadedFile object
         
@@ -26,29 +45,143 @@ def save_uploaded_file(uploaded_file) -> str:
         Path to saved file
     """
     try:
-        # Create a unique filename
-        file_path = os.path.join(TEMP_DIR, uploaded_file.name)
+        # Name the file after its content
+        digest = hashlib.sha256(uploaded_file.getbuffer()).hexdigest()[:16]
+        ext = os.path.splitext(uploaded_file.name)[1].lower()
+        file_path = os.path.join(TEMP_DIR, f"{digest}{ext}")
+        if os.path.exists(file_path):
+            return file_path
         
-        # Save the file
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        # Stream to a private file, then move it into place atomically
+        uploaded_file.seek(0)
+        with tempfile.NamedTemporaryFile(dir=TEMP_DIR, suffix=".part", delete=False) as f:
+            shutil.copyfileobj(uploaded_file, f, COPY_BUFFER_SIZE)
+        os.replace(f.name, file_path)
         
         return file_path
     except Exception as e:
         raise Exception(f"Failed to save uploaded file: {str(e)}")
 
 
-def display_image_with_info(image_path: str, caption: str = "", width: Optional[int] = None):
+def decode_image_bytes(image_bytes: bytes) -> np.ndarray:
+    """
+    Decode encoded image bytes (JPEG/PNG) into a BGR array.
+    
+    Args:
+        image_bytes: Raw encoded image content
+        
+    Returns:
+        Decoded image as a BGR numpy array
+    """
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise Exception("Failed to decode image")
+    return image
+
+
+def downscale_image(image: np.ndarray, max_edge: int = MAX_IMAGE_EDGE) -> np.ndarray:
+    """
+    Shrink an image so its longest edge is at most max_edge pixels.
+    
+    Args:
+        image: Image array
+        max_edge: Maximum length of the longest edge
+        
+    Returns:
+        The resized image, or the input unchanged if it is already small enough
+    """
+    height, width = image.shape[:2]
+    scale = max_edge / max(height, width)
+    if scale >= 1:
+        return image
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def decode_and_downscale(image_bytes: bytes, max_edge: int = MAX_IMAGE_EDGE) -> np.ndarray:
+    """
+    Decode encoded image bytes and shrink the result to at most max_edge pixels.
+    
+    Safe to call from worker threads, unlike the memoized load_uploaded_image.
+    
+    Args:
+        image_bytes: Raw encoded image content
+        max_edge: Maximum length of the longest edge
+        
+    Returns:
+        Decoded, downscaled image as a BGR numpy array
+    """
+    return downscale_image(decode_image_bytes(image_bytes), max_edge)
+
+
+# Memoized per upload content for load_uploaded_image
+_decode_upload = st.cache_data(show_spinner=False, max_entries=8)(decode_and_downscale)
+
+
+def load_uploaded_image(uploaded_file) -> np.ndarray:
+    """
+    Decode a Streamlit uploaded file into a BGR array without touching disk.
+    
+    Large photos are downscaled to MAX_IMAGE_EDGE so face detection and
+    display work on far fewer pixels; faces stay well above ArcFace's
+    112px input. The result is memoized on the file content, so reruns
+    reuse it instead of decoding the upload again.
+    
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        
+    Returns:
+        Decoded image as a BGR numpy array
+    """
+    try:
+        return _decode_upload(uploaded_file.getvalue())
+    except Exception as e:
+        raise Exception(f"Failed to load uploaded image: {str(e)}")
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _thumbnail_bytes(image_path: str, mtime: float) -> bytes:
+    """Downscale and JPEG-encode an image file once per (path, modification time)."""
+    with Image.open(image_path) as image:
+        image.thumbnail((DISPLAY_MAX_EDGE, DISPLAY_MAX_EDGE))
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, "JPEG", quality=DISPLAY_JPEG_QUALITY)
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _encoded_bytes(image: np.ndarray) -> bytes:
+    """Downscale and JPEG-encode a BGR array once per content."""
+    ok, encoded = cv2.imencode(
+        ".jpg",
+        downscale_image(image, DISPLAY_MAX_EDGE),
+        [cv2.IMWRITE_JPEG_QUALITY, DISPLAY_JPEG_QUALITY]
+    )
+    if not ok:
+        raise Exception("Failed to encode image")
+    return encoded.tobytes()
+
+
+def display_image_with_info(
+    image_path: Union[str, np.ndarray],
+    caption: str = "",
+    width: Optional[int] = None
+):
     """
     Display an image in Streamlit with optional caption.
     
+    The image is sent to the browser as a bounded JPEG that is encoded once
+    and cached, rather than re-encoded from full resolution on every rerun.
+    
     Args:
-        image_path: Path to image file
+        image_path: Path to image file or decoded BGR image array
         caption: Caption to display below image
         width: Optional width for the image
     """
     try:
-        image = Image.open(image_path)
+        if isinstance(image_path, np.ndarray):
+            image = _encoded_bytes(image_path)
+        else:
+            image = _thumbnail_bytes(image_path, os.path.getmtime(image_path))
         if width:
             st.image(image, caption=caption, width=width)
         else:
@@ -95,16 +228,33 @@ def create_comparison_view(img1_path: str, img2_path: str, result: dict):
         st.metric("Confidence", f"{confidence:.1f}%")
 
 
-def cleanup_temp_files():
+def cleanup_temp_files(max_age_seconds: float = 600) -> int:
     """
-    Clean up temporary files in the temp directory.
+    Clean up stale temporary files in the temp directory.
+    
+    Only files older than max_age_seconds are removed; the directory itself
+    and recent uploads (possibly in use by other sessions) are left alone.
+    
+    Args:
+        max_age_seconds: Files last modified longer ago than this are removed
+        
+    Returns:
+        Number of files removed
     """
+    cutoff = time.time() - max_age_seconds
+    removed = 0
     try:
-        if os.path.exists(TEMP_DIR):
-            shutil.rmtree(TEMP_DIR)
-            os.makedirs(TEMP_DIR, exist_ok=True)
+        with os.scandir(TEMP_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
     except Exception as e:
         print(f"Warning: Failed to clean up temp files: {str(e)}")
+    return removed
 
 
 def format_emotion_results(emotion_dict: dict) -> str:
@@ -117,11 +267,8 @@ def format_emotion_results(emotion_dict: dict) -> str:
     Returns:
         Formatted string with emotions sorted by score
     """
-    sorted_emotions = sorted(emotion_dict.items(), key=lambda x: x[1], reverse=True)
-    result = []
-    for emotion, score in sorted_emotions:
-        result.append(f"**{emotion.capitalize()}**: {score:.2f}%")
-    return "\n".join(result)
+    sorted_emotions = sorted(emotion_dict.items(), key=itemgetter(1), reverse=True)
+    return "\n".join(f"**{emotion.capitalize()}**: {score:.2f}%" for emotion, score in sorted_emotions)
 
 
 def get_image_size(image_path: str) -> tuple:
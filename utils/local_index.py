@@ -0,0 +1,426 @@
+"""
+Local face index used when Pinecone is not configured.
+"""
+
+from typing import Callable, Dict, List, Optional, Union
+import json
+import os
+import threading
+import numpy as np
+
+
+# Default location of the on-disk index (override with LOCAL_INDEX_PATH)
+DEFAULT_INDEX_PATH = "local_index.npz"
+
+# With binary quantization, this many candidates per requested result are
+# taken from the Hamming pass and rescored exactly
+BINARY_OVERSAMPLE = 10
+
+# Number of set bits in each byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Comparison operators supported in metadata filters (Pinecone syntax)
+_FILTER_OPERATORS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, in O(n + k log k)."""
+    if k == 1:
+        return np.array([np.argmax(scores)])
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def _matches_filter(metadata: Dict, metadata_filter: Dict) -> bool:
+    """
+    Check metadata against a Pinecone-style filter of field conditions,
+    combined with $and/$or and checked for presence with $exists.
+
+    Raises:
+        ValueError: If the filter uses an operator Pinecone does not define
+    """
+    for field, condition in metadata_filter.items():
+        if field in ("$and", "$or"):
+            results = (_matches_filter(metadata, clause) for clause in condition)
+            if not (all(results) if field == "$and" else any(results)):
+                return False
+            continue
+        if field.startswith("$"):
+            raise ValueError(f"Unsupported filter operator: {field}")
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        value = metadata.get(field)
+        for operator, target in condition.items():
+            if operator == "$exists":
+                matched = (field in metadata) == bool(target)
+            elif operator in _FILTER_OPERATORS:
+                matched = _FILTER_OPERATORS[operator](value, target)
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if not matched:
+                return False
+    return True
+
+
+class LocalIndex:
+    """
+    In-process face index with the same interface as PineconeHelper.
+
+    Embeddings are kept L2-normalized in one float32 matrix, so a search is
+    a single matrix-vector product. The index is saved to a .npz file after
+    every change.
+
+    With quantize="binary", the sign bits of each embedding are also kept
+    packed (64 bytes per face instead of 2KB). Searches then rank every face
+    by Hamming distance on those bits and rescore only the best candidates
+    with exact cosine similarity.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INDEX_PATH, dimension: int = 512, quantize: Optional[str] = None):
+        """
+        Initialize the local index, loading it from disk if it exists.
+
+        Args:
+            path: Path of the .npz file backing the index, or None to keep
+                the index in memory only
+            dimension: Dimension of the embeddings (must match the model)
+            quantize: None for exact search, or "binary" for a Hamming prefilter
+        """
+        if quantize not in (None, "binary"):
+            raise Exception(f"Unsupported quantization: {quantize}")
+
+        self.path = path
+        self.dimension = dimension
+        self.quantize = quantize
+        self._lock = threading.RLock()
+        self._matrix = np.empty((0, dimension), dtype=np.float32)
+        self._codes = np.empty((0, (dimension + 7) // 8), dtype=np.uint8)
+        self._ids: List[str] = []
+        self._metadata: List[Dict] = []
+
+        self._load()
+        self._update_codes()
+
+    def _load(self):
+        """Load the index from disk if the file exists."""
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                self._matrix = data["matrix"].astype(np.float32)
+                self._ids = [str(face_id) for face_id in data["ids"]]
+                self._metadata = json.loads(str(data["metadata"]))
+        except Exception as e:
+            raise Exception(f"Failed to load local index: {str(e)}")
+
+    def _save(self):
+        """Write the index to disk atomically."""
+        if self.path is None:
+            return
+        partial_path = f"{self.path}.part"
+        with open(partial_path, "wb") as f:
+            np.savez(
+                f,
+                matrix=self._matrix,
+                ids=np.array(self._ids, dtype=str),
+                metadata=np.array(json.dumps(self._metadata))
+            )
+        os.replace(partial_path, self.path)
+
+    def _update_codes(self):
+        """Repack the sign bits of the matrix when binary quantization is on."""
+        if self.quantize == "binary":
+            self._codes = np.packbits(self._matrix > 0, axis=1)
+
+    def _binary_candidates(self, query: np.ndarray, count: int, allowed: Optional[np.ndarray]) -> np.ndarray:
+        """Rows with the smallest Hamming distance to the query's sign bits."""
+        rows = np.flatnonzero(allowed) if allowed is not None else np.arange(len(self._ids))
+        if rows.size == 0:
+            return rows
+        query_codes = np.packbits(query > 0)
+        distances = _POPCOUNT[np.bitwise_xor(self._codes[rows], query_codes)].sum(axis=1, dtype=np.int32)
+        return rows[_top_k(-distances, count)]
+
+    def _normalize(self, embeddings) -> np.ndarray:
+        """L2-normalize one embedding or a stack of embeddings."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.where(norms > 0, norms, 1.0)
+
+    def register_face(
+        self,
+        embedding: Union[List[float], np.ndarray],
+        face_id: str,
+        metadata: Optional[Dict] = None
+    ) -> bool:
+        """
+        Register a face embedding in the local index.
+
+        Args:
+            embedding: Face embedding vector
+            face_id: Unique identifier for the face
+            metadata: Optional metadata (name, date, etc.)
+
+        Returns:
+            True if successful
+        """
+        self.register_faces_batch([{"id": face_id, "values": embedding, "metadata": metadata or {}}])
+        return True
+
+    def register_faces_batch(self, items: List[Dict]) -> int:
+        """
+        Register multiple face embeddings, replacing entries with the same id.
+
+        Args:
+            items: List of dicts with id, values (embedding) and metadata
+
+        Returns:
+            Number of faces registered
+        """
+        if not items:
+            return 0
+        try:
+            with self._lock:
+                new_ids = {item["id"] for item in items}
+                keep = [i for i, face_id in enumerate(self._ids) if face_id not in new_ids]
+
+                rows = self._normalize([item["values"] for item in items])
+                self._matrix = np.vstack([self._matrix[keep], rows])
+                self._ids = [self._ids[i] for i in keep] + [item["id"] for item in items]
+                self._metadata = [self._metadata[i] for i in keep] + [item.get("metadata") or {} for item in items]
+                self._update_codes()
+                self._save()
+            return len(items)
+
+        except Exception as e:
+            raise Exception(f"Failed to register faces: {str(e)}")
+
+    def register_faces_bulk(
+        self,
+        embeddings: np.ndarray,
+        face_ids: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        batch_size: int = 100
+    ) -> int:
+        """
+        Register a stack of face embeddings held in one array.
+
+        Args:
+            embeddings: Array of shape (N, dimension)
+            face_ids: Unique identifier for each row
+            metadatas: Optional metadata for each row
+            batch_size: Accepted for parity with PineconeHelper; local writes
+                are not batched
+
+        Returns:
+            Number of faces registered
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if metadatas is None:
+            metadatas = [{}] * len(embeddings)
+        return self.register_faces_batch([
+            {"id": face_id, "values": row, "metadata": metadata or {}}
+            for face_id, row, metadata in zip(face_ids, embeddings, metadatas)
+        ])
+
+    def search_faces(
+        self,
+        query_embedding: Union[List[float], np.ndarray],
+        top_k: int = 5,
+        score_threshold: float = 0.0,
+        metadata_filter: Optional[Dict] = None,
+        include_values: bool = False,
+        oversample_factor: int = 1,
+        client_filter: Optional[Callable[[Dict], bool]] = None
+    ) -> List[Dict]:
+        """
+        Search for similar faces with one matrix-vector product.
+
+        Args:
+            query_embedding: Query face embedding
+            top_k: Number of results to return
+            score_threshold: Minimum similarity score (0-1)
+            metadata_filter: Optional Pinecone-style metadata filter
+            include_values: Also return the stored embedding of each match
+            oversample_factor: Accepted for parity with PineconeHelper; the
+                search is exact, so filters never need extra candidates
+            client_filter: Optional predicate on an entry's metadata
+
+        Returns:
+            List of matches with id, score, and metadata (plus values if requested)
+        """
+        with self._lock:
+            if not self._ids or top_k <= 0:
+                return []
+
+            query = self._normalize(query_embedding)
+            allowed = None
+            if metadata_filter or client_filter:
+                allowed = np.fromiter(
+                    (
+                        (not metadata_filter or _matches_filter(meta, metadata_filter))
+                        and (client_filter is None or client_filter(meta))
+                        for meta in self._metadata
+                    ),
+                    dtype=bool,
+                    count=len(self._metadata)
+                )
+
+            if self.quantize == "binary":
+                # Exact scores only for the best Hamming candidates
+                candidates = self._binary_candidates(query, top_k * BINARY_OVERSAMPLE, allowed)
+                scores = np.full(len(self._ids), -np.inf, dtype=np.float32)
+                scores[candidates] = self._matrix[candidates] @ query
+            else:
+                scores = self._matrix @ query
+                if allowed is not None:
+                    scores = np.where(allowed, scores, -np.inf)
+
+            matches = []
+            for i in _top_k(scores, top_k):
+                if scores[i] < score_threshold:
+                    break
+                entry = {
+                    "id": self._ids[i],
+                    "score": float(scores[i]),
+                    "metadata": self._metadata[i]
+                }
+                if include_values:
+                    entry["values"] = self._matrix[i].tolist()
+                matches.append(entry)
+            return matches
+
+    async def search_faces_many(
+        self,
+        query_embeddings: List[Union[List[float], np.ndarray]],
+        top_k: int = 5,
+        score_threshold: float = 0.0,
+        metadata_filter: Optional[Dict] = None,
+        include_values: bool = False
+    ) -> List[List[Dict]]:
+        """
+        Search for several query faces (counterpart of PineconeHelper.search_faces_many).
+
+        Local searches are in-memory, so they simply run one after another.
+
+        Args:
+            query_embeddings: Query face embeddings
+            top_k: Number of results to return per query
+            score_threshold: Minimum similarity score (0-1)
+            metadata_filter: Optional Pinecone-style metadata filter
+            include_values: Also return the stored embedding of each match
+
+        Returns:
+            One list of matches per query, in the order of query_embeddings
+        """
+        return [
+            self.search_faces(query_embedding, top_k, score_threshold, metadata_filter, include_values)
+            for query_embedding in query_embeddings
+        ]
+
+    def delete_face(self, face_id: str) -> bool:
+        """
+        Delete a face from the local index.
+
+        Args:
+            face_id: ID of the face to delete
+
+        Returns:
+            True if successful
+        """
+        self.delete_faces([face_id])
+        return True
+
+    def delete_faces(self, face_ids: List[str]) -> int:
+        """
+        Delete several faces in one pass over the index.
+
+        Args:
+            face_ids: IDs of the faces to delete
+
+        Returns:
+            Number of ids submitted for deletion
+        """
+        try:
+            with self._lock:
+                removed = set(face_ids)
+                keep = [i for i, existing in enumerate(self._ids) if existing not in removed]
+                self._matrix = self._matrix[keep]
+                self._ids = [self._ids[i] for i in keep]
+                self._metadata = [self._metadata[i] for i in keep]
+                self._update_codes()
+                self._save()
+            return len(face_ids)
+        except Exception as e:
+            raise Exception(f"Failed to delete faces: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get index statistics.
+
+        Returns:
+            Dictionary with index stats
+        """
+        with self._lock:
+            return {
+                "total_vectors": len(self._ids),
+                "dimension": self.dimension
+            }
+
+    def ping(self) -> bool:
+        """
+        No-op counterpart of PineconeHelper.ping; the local index is always ready.
+
+        Returns:
+            True
+        """
+        return True
+
+    def list_all_faces(self, include_values: bool = False) -> List[Dict]:
+        """
+        List all face entries in the index with their metadata.
+
+        Args:
+            include_values: Also return each stored embedding
+
+        Returns:
+            List of dicts with id and metadata (plus values if requested) for each entry
+        """
+        with self._lock:
+            entries = [
+                {"id": face_id, "metadata": metadata}
+                for face_id, metadata in zip(self._ids, self._metadata)
+            ]
+            if include_values:
+                for entry, values in zip(entries, self._matrix.tolist()):
+                    entry["values"] = values
+            return entries
+
+
+def initialize_local_index_from_env() -> LocalIndex:
+    """
+    Initialize the local index from environment variables.
+
+    Returns:
+        LocalIndex instance backed by LOCAL_INDEX_PATH, using the
+        quantization named by LOCAL_INDEX_QUANTIZE (e.g. "binary") if set
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    path = os.getenv("LOCAL_INDEX_PATH", DEFAULT_INDEX_PATH)
+    quantize = os.getenv("LOCAL_INDEX_QUANTIZE") or None
+
+    # ArcFace uses 512-dimensional embeddings
+    return LocalIndex(path=path, dimension=512, quantize=quantize)
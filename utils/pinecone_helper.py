@@ -2,16 +2,181 @@
 Pinecone vector database helper functions.
 """
 
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import asyncio
 import os
+import random
+import threading
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
+from pinecone.exceptions import PineconeException
 import time
 
+from .local_index import LocalIndex
+
+try:
+    # gRPC transport (installed with pinecone[grpc]) has lower per-request overhead
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
+
+try:
+    import grpc
+except ImportError:
+    grpc = None
+
+
+# Maximum number of vectors sent in a single upsert request
+UPSERT_BATCH_SIZE = 100
+
+# Maximum number of ids requested in a single fetch or delete
+FETCH_BATCH_SIZE = 100
+DELETE_BATCH_SIZE = 1000
+
+# Threads the index client uses for concurrent (async_req) requests
+DEFAULT_POOL_THREADS = 8
+
+# Identical queries within this many seconds are answered from memory
+QUERY_CACHE_TTL = 5.0
+QUERY_CACHE_SIZE = 1024
+
+# Index stats are reused for this many seconds
+STATS_CACHE_TTL = 2.0
+
+# The most recent registrations are also searched in memory and merged into
+# Pinecone's results, since Pinecone may not have made them queryable yet
+HOT_CACHE_SIZE = 256
+
+# Rate-limited (429) and server-error (5xx) requests, and their gRPC
+# counterparts, are retried with exponential backoff and full jitter
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 5.0
+
+# The local mirror is rebuilt in the background once it is this many seconds
+# old, picking up faces registered or deleted by other processes
+MIRROR_REFRESH_INTERVAL = 300
+
+# A mirror search whose best match scores below this also queries Pinecone,
+# which may hold a closer face registered by another process
+MIRROR_CONFIDENT_SCORE = 0.85
+
+# How long to wait for a newly created index, and how often to check it
+INDEX_READY_TIMEOUT = 30
+INDEX_READY_POLL_INTERVAL = 0.5
+
+# Client and index handles shared by helpers for the same (api_key, index_name, pool_threads)
+_INDEX_CACHE: Dict[Tuple[str, str, int], Tuple] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+# One lock per (api_key, index_name), held while an index is created and
+# connected so slow index creation does not block helpers for other indexes
+_INDEX_KEY_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+
+# Search caches shared by helpers for the same (api_key, index_name), whatever their pool size
+_SHARED_CACHES: Dict[Tuple[str, str], "_IndexCaches"] = {}
+
+# Embeddings may be passed as float lists or NumPy arrays
+Embedding = Union[List[float], np.ndarray]
+
+# Similarity metric for newly created indexes. Embeddings are L2-normalized
+# when extracted, so a dot product equals cosine without per-query norms.
+INDEX_METRIC = "dotproduct"
+
+
+# Exceptions a failed request may surface with: the HTTP client raises
+# PineconeApiException (a PineconeException), the gRPC client raises
+# PineconeException wrapping a grpc.RpcError or the RpcError itself
+_RETRY_EXCEPTIONS = (PineconeException,) if grpc is None else (PineconeException, grpc.RpcError)
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed request is worth retrying (rate limit or server error)."""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if grpc is not None:
+        for cause in (error, error.__cause__):
+            if isinstance(cause, grpc.RpcError):
+                return cause.code() in (
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    grpc.StatusCode.UNAVAILABLE,
+                    grpc.StatusCode.INTERNAL,
+                )
+    return False
+
+
+def _with_retry(request, *args, **kwargs):
+    """Send a Pinecone request, retrying transient failures with jittered backoff."""
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return request(*args, **kwargs)
+        except _RETRY_EXCEPTIONS as e:
+            if attempt == RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            time.sleep(random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)))
+
+
+def _wait(async_result):
+    """Block on an async request from either client (gRPC futures or HTTP ApplyResults)."""
+    if hasattr(async_result, "result"):
+        return async_result.result()
+    return async_result.get()
+
+
+def _as_values(embedding: Embedding) -> List[float]:
+    """Convert an embedding to the float list sent to Pinecone, in one pass."""
+    if isinstance(embedding, list):
+        return embedding
+    return np.asarray(embedding, dtype=np.float32).tolist()
+
+
+def _merge_matches(first: List[Dict], second: List[Dict], top_k: int) -> List[Dict]:
+    """Combine two match lists, keeping the first entry per id, best scores first."""
+    merged = {}
+    for match in first + second:
+        merged.setdefault(match["id"], match)
+    return sorted(merged.values(), key=lambda match: match["score"], reverse=True)[:top_k]
+
+
+class _IndexCaches:
+    """
+    Query cache, stats cache and hot set for one index. Helpers for the same
+    index share a single instance, so a write through any of them
+    invalidates the cached results of all.
+    """
+    
+    def __init__(self, dimension: int):
+        self.lock = threading.Lock()
+        self.queries = OrderedDict()
+        self.stats = None
+        self.hot = LocalIndex(path=None, dimension=dimension)
+        self.hot_ids = OrderedDict()
+
+
+def _shared_caches(api_key: str, index_name: str, dimension: int) -> _IndexCaches:
+    """Return the caches shared by every helper for this index, creating them on first use."""
+    key = (api_key, index_name)
+    with _INDEX_CACHE_LOCK:
+        caches = _SHARED_CACHES.get(key)
+        if caches is None:
+            caches = _SHARED_CACHES[key] = _IndexCaches(dimension)
+        return caches
+
 
 class PineconeHelper:
     """Helper class for Pinecone vector database operations."""
     
-    def __init__(self, api_key: str, index_name: str = "face-recognition-index", dimension: int = 512):
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str = "face-recognition-index",
+        dimension: int = 512,
+        pool_threads: int = DEFAULT_POOL_THREADS,
+        local_mirror: bool = False
+    ):
         """
         Initialize Pinecone helper.
         
@@ -19,47 +184,133 @@ class PineconeHelper:
             api_key: Pinecone API key
             index_name: Name of the Pinecone index
             dimension: Dimension of the embeddings (must match the model)
+            pool_threads: Size of the thread pool used for concurrent upserts
+            local_mirror: Keep an in-memory copy of the index and answer
+                searches from it; Pinecone stays the source of truth and the
+                copy is reloaded every MIRROR_REFRESH_INTERVAL seconds
         """
         self.api_key = api_key
         self.index_name = index_name
         self.dimension = dimension
+        self.pool_threads = pool_threads
         self.pc = None
         self.index = None
+        self._caches = _shared_caches(api_key, index_name, dimension)
+        self._mirror: Optional[LocalIndex] = None
+        self._mirror_loaded_at = 0.0
+        self._mirror_refreshing = False
+        # Mirror writes made while a reload is listing the index, replayed onto the new copy
+        self._mirror_pending: List[Tuple[str, List]] = []
         
         self._initialize()
+        if local_mirror:
+            self._load_mirror()
     
     def _initialize(self):
         """Initialize Pinecone connection and create/connect to index."""
         try:
-            # Initialize Pinecone
-            self.pc = Pinecone(api_key=self.api_key)
-            
-            # Check if index exists, if not create it
-            existing_indexes = [index.name for index in self.pc.list_indexes()]
-            
-            if self.index_name not in existing_indexes:
-                # Create new index with serverless spec
-                self.pc.create_index(
-                    name=self.index_name,
-                    dimension=self.dimension,
-                    metric='cosine',
-                    spec=ServerlessSpec(
-                        cloud='aws',
-                        region='us-east-1'
+            key = (self.api_key, self.index_name, self.pool_threads)
+            with _INDEX_CACHE_LOCK:
+                key_lock = _INDEX_KEY_LOCKS.setdefault(key[:2], threading.Lock())
+            with key_lock:
+                # Reuse the client and index handle (and their open connections)
+                # of any earlier helper for the same index
+                with _INDEX_CACHE_LOCK:
+                    cached = _INDEX_CACHE.get(key)
+                if cached is not None:
+                    self.pc, self.index = cached
+                    return
+                
+                # Initialize Pinecone, preferring the gRPC client when it is installed
+                client = PineconeGRPC if PineconeGRPC is not None else Pinecone
+                self.pc = client(api_key=self.api_key)
+                
+                # Check if index exists, if not create it
+                existing_indexes = [index.name for index in self.pc.list_indexes()]
+                
+                if self.index_name not in existing_indexes:
+                    # Create new index with serverless spec
+                    self.pc.create_index(
+                        name=self.index_name,
+                        dimension=self.dimension,
+                        metric=INDEX_METRIC,
+                        spec=ServerlessSpec(
+                            cloud='aws',
+                            region='us-east-1'
+                        )
                     )
-                )
-                # Wait for index to be ready
-                time.sleep(1)
-            
-            # Connect to the index
-            self.index = self.pc.Index(self.index_name)
+                    self._wait_until_ready()
+                
+                # Connect to the index
+                self.index = self.pc.Index(self.index_name, pool_threads=self.pool_threads)
+                with _INDEX_CACHE_LOCK:
+                    _INDEX_CACHE[key] = (self.pc, self.index)
             
         except Exception as e:
             raise Exception(f"Failed to initialize Pinecone: {str(e)}")
     
+    def _wait_until_ready(self):
+        """Poll a newly created index until Pinecone reports it ready."""
+        deadline = time.monotonic() + INDEX_READY_TIMEOUT
+        while not self.pc.describe_index(self.index_name).status["ready"]:
+            if time.monotonic() >= deadline:
+                raise Exception(f"Index {self.index_name} not ready after {INDEX_READY_TIMEOUT}s")
+            time.sleep(INDEX_READY_POLL_INTERVAL)
+    
+    def _load_mirror(self):
+        """Copy every stored vector into the in-memory mirror."""
+        self._mirror_loaded_at = time.monotonic()
+        try:
+            mirror = LocalIndex(path=None, dimension=self.dimension)
+            mirror.register_faces_batch(self.list_all_faces(include_values=True))
+        except Exception:
+            with self._caches.lock:
+                self._mirror_pending = []
+                self._mirror_refreshing = False
+            raise
+        
+        with self._caches.lock:
+            # Writes made while the listing was taken may be missing from it
+            for operation, payload in self._mirror_pending:
+                self._apply_to_mirror(mirror, operation, payload)
+            self._mirror_pending = []
+            self._mirror = mirror
+            self._mirror_refreshing = False
+    
+    def _update_mirror(self, operation: str, payload: List):
+        """Apply a write to the mirror, recording it for replay if a reload is in progress."""
+        with self._caches.lock:
+            if self._mirror_refreshing:
+                self._mirror_pending.append((operation, payload))
+            self._apply_to_mirror(self._mirror, operation, payload)
+    
+    @staticmethod
+    def _apply_to_mirror(mirror: LocalIndex, operation: str, payload: List):
+        """Apply a recorded "register" (vectors) or "delete" (ids) write to a mirror."""
+        if operation == "register":
+            mirror.register_faces_batch(payload)
+        else:
+            mirror.delete_faces(payload)
+    
+    def _refresh_mirror(self):
+        """Reload a stale mirror in a background thread, keeping the old copy until it is ready."""
+        with self._caches.lock:
+            if self._mirror_refreshing or time.monotonic() - self._mirror_loaded_at < MIRROR_REFRESH_INTERVAL:
+                return
+            self._mirror_refreshing = True
+        
+        def reload():
+            try:
+                self._load_mirror()
+            except Exception:
+                # Keep serving the previous copy; the next search retries
+                pass
+        
+        threading.Thread(target=reload, daemon=True).start()
+    
     def register_face(
         self,
-        embedding: List[float],
+        embedding: Embedding,
         face_id: str,
         metadata: Optional[Dict] = None
     ) -> bool:
@@ -74,64 +325,278 @@ class PineconeHelper:
         Returns:
             True if successful
         """
-        try:
-            if metadata is None:
-                metadata = {}
+        self.register_faces_batch([{"id": face_id, "values": embedding, "metadata": metadata or {}}])
+        return True
+    
+    def register_faces_batch(self, items: List[Dict], batch_size: int = UPSERT_BATCH_SIZE) -> int:
+        """
+        Register multiple face embeddings using batched upserts.
+        
+        When there is more than one batch, the upserts are sent concurrently
+        on the index client's thread pool.
+        
+        Args:
+            items: List of dicts with id, values (embedding list or array) and metadata
+            batch_size: Number of vectors sent per upsert request
             
-            # Upsert the embedding
-            self.index.upsert(
-                vectors=[
-                    {
-                        "id": face_id,
-                        "values": embedding,
-                        "metadata": metadata
-                    }
-                ]
-            )
-            return True
+        Returns:
+            Number of faces registered
+        """
+        vectors = [{**item, "values": _as_values(item["values"])} for item in items]
+        chunks = [vectors[i:i + batch_size] for i in range(0, len(vectors), batch_size)]
+        if len(chunks) == 1:
+            self._upsert_chunk(chunks[0])
+        else:
+            # Send all chunks concurrently, then wait on each to surface errors.
+            # Upserts are idempotent, so a transiently failed chunk is simply resent.
+            async_results = [self.index.upsert(vectors=chunk, async_req=True) for chunk in chunks]
+            for chunk, result in zip(chunks, async_results):
+                try:
+                    _wait(result)
+                except _RETRY_EXCEPTIONS as e:
+                    if not _is_retryable(e):
+                        raise
+                    self._upsert_chunk(chunk)
+        if self._mirror is not None:
+            self._update_mirror("register", vectors)
+        self._remember(vectors)
+        self._invalidate_caches()
+        return len(items)
+    
+    def register_faces_bulk(
+        self,
+        embeddings: np.ndarray,
+        face_ids: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        batch_size: int = UPSERT_BATCH_SIZE
+    ) -> int:
+        """
+        Register a stack of face embeddings held in one array.
+        
+        The whole (N, dimension) array is converted to Python floats in a
+        single call instead of row by row.
+        
+        Args:
+            embeddings: Array of shape (N, dimension)
+            face_ids: Unique identifier for each row
+            metadatas: Optional metadata for each row
+            batch_size: Number of vectors sent per upsert request
             
-        except Exception as e:
-            raise Exception(f"Failed to register face: {str(e)}")
+        Returns:
+            Number of faces registered
+        """
+        rows = np.asarray(embeddings, dtype=np.float32).tolist()
+        if metadatas is None:
+            metadatas = [{}] * len(rows)
+        items = [
+            {"id": face_id, "values": values, "metadata": metadata or {}}
+            for face_id, values, metadata in zip(face_ids, rows, metadatas)
+        ]
+        return self.register_faces_batch(items, batch_size)
     
     def search_faces(
         self,
-        query_embedding: List[float],
+        query_embedding: Embedding,
         top_k: int = 5,
-        score_threshold: float = 0.0
+        score_threshold: float = 0.0,
+        metadata_filter: Optional[Dict] = None,
+        include_values: bool = False,
+        oversample_factor: int = 1,
+        client_filter: Optional[Callable[[Dict], bool]] = None
     ) -> List[Dict]:
         """
         Search for similar faces in Pinecone.
         
+        With a local mirror, the search runs in memory and only falls back to
+        Pinecone when the mirror's best match scores below
+        MIRROR_CONFIDENT_SCORE (or there is none). Otherwise Pinecone is queried
+        and matches among the most recent registrations, which Pinecone may
+        not return yet, are merged into its results. Pinecone results are
+        cached for QUERY_CACHE_TTL seconds, so re-checking the same face skips
+        the round trip; any write clears the cache. Searches with a
+        client_filter are not cached.
+        
         Args:
             query_embedding: Query face embedding
             top_k: Number of results to return
             score_threshold: Minimum similarity score (0-1)
+            metadata_filter: Optional Pinecone metadata filter applied before
+                the similarity search, e.g. {"department": {"$eq": "Engineering"}}
+            include_values: Also return the stored embedding of each match
+            oversample_factor: Fetch top_k * oversample_factor candidates so
+                enough remain after client-side filtering
+            client_filter: Optional predicate on a match's metadata, for
+                conditions Pinecone's filter syntax cannot express
             
         Returns:
-            List of matches with id, score, and metadata
+            List of matches with id, score, and metadata (plus values if requested)
         """
-        try:
-            # Query the index
-            results = self.index.query(
-                vector=query_embedding,
-                top_k=top_k,
-                include_metadata=True
+        if self._mirror is not None:
+            self._refresh_mirror()
+            matches = self._mirror.search_faces(
+                query_embedding, top_k, score_threshold, metadata_filter, include_values,
+                client_filter=client_filter
             )
+            # Faces registered by other processes since the last reload are only
+            # in Pinecone, and may be closer than a weak mirror match
+            if matches and matches[0]["score"] >= MIRROR_CONFIDENT_SCORE:
+                return matches
+            recent = []
+        else:
+            recent = self._caches.hot.search_faces(
+                query_embedding, top_k, score_threshold, metadata_filter, include_values,
+                client_filter=client_filter
+            )
+        
+        matches = self._search_index(
+            query_embedding, top_k, score_threshold, metadata_filter, include_values,
+            oversample_factor, client_filter
+        )
+        if recent:
+            matches = _merge_matches(recent, matches, top_k)
+        return matches
+    
+    def _search_index(
+        self,
+        query_embedding: Embedding,
+        top_k: int,
+        score_threshold: float,
+        metadata_filter: Optional[Dict],
+        include_values: bool,
+        oversample_factor: int,
+        client_filter: Optional[Callable[[Dict], bool]]
+    ) -> List[Dict]:
+        """Query Pinecone itself, answering repeated queries from the query cache."""
+        key = None
+        if client_filter is None:
+            key = (
+                np.asarray(query_embedding, dtype=np.float32).tobytes(),
+                top_k,
+                score_threshold,
+                repr(metadata_filter),
+                include_values,
+                oversample_factor
+            )
+            cached = self._get_cached_query(key)
+            if cached is not None:
+                return cached
+        
+        # Query the index
+        results = self._query(
+            vector=_as_values(query_embedding),
+            top_k=top_k * oversample_factor,
+            include_metadata=True,
+            include_values=include_values,
+            filter=metadata_filter
+        )
+        
+        matches = self._format(results, score_threshold, include_values)
+        if client_filter is not None:
+            matches = [match for match in matches if client_filter(match["metadata"] or {})]
+        matches = matches[:top_k]
+        
+        if key is not None:
+            with self._caches.lock:
+                self._caches.queries[key] = (time.monotonic(), matches)
+                if len(self._caches.queries) > QUERY_CACHE_SIZE:
+                    self._caches.queries.popitem(last=False)
+        return [dict(match) for match in matches]
+    
+    async def search_faces_many(
+        self,
+        query_embeddings: List[Embedding],
+        top_k: int = 5,
+        score_threshold: float = 0.0,
+        metadata_filter: Optional[Dict] = None,
+        include_values: bool = False
+    ) -> List[List[Dict]]:
+        """
+        Search for several query faces concurrently.
+        
+        Each query runs in a worker thread, so N searches take about one
+        round trip instead of N.
+        
+        Args:
+            query_embeddings: Query face embeddings
+            top_k: Number of results to return per query
+            score_threshold: Minimum similarity score (0-1)
+            metadata_filter: Optional Pinecone metadata filter applied to every query
+            include_values: Also return the stored embedding of each match
             
-            # Filter by threshold and format results
-            matches = []
-            for match in results.matches:
-                if match.score >= score_threshold:
-                    matches.append({
-                        "id": match.id,
-                        "score": match.score,
-                        "metadata": match.metadata
-                    })
-            
-            return matches
-            
-        except Exception as e:
-            raise Exception(f"Failed to search faces: {str(e)}")
+        Returns:
+            One list of matches per query, in the order of query_embeddings
+        """
+        # search_faces handles the mirror, the query cache and retries
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(
+                self.search_faces,
+                query_embedding,
+                top_k,
+                score_threshold,
+                metadata_filter,
+                include_values
+            )
+            for query_embedding in query_embeddings
+        )))
+    
+    def _remember(self, vectors: List[Dict]):
+        """Add just-registered vectors to the hot set, evicting the oldest."""
+        recent = vectors[-HOT_CACHE_SIZE:]
+        with self._caches.lock:
+            for vector in recent:
+                self._caches.hot_ids[vector["id"]] = None
+                self._caches.hot_ids.move_to_end(vector["id"])
+            evicted = []
+            while len(self._caches.hot_ids) > HOT_CACHE_SIZE:
+                evicted.append(self._caches.hot_ids.popitem(last=False)[0])
+            # Update the index under the same lock so a concurrent
+            # registration cannot evict ids before they are inserted
+            self._caches.hot.register_faces_batch(recent)
+            if evicted:
+                self._caches.hot.delete_faces(evicted)
+    
+    def _upsert_chunk(self, vectors: List[Dict]):
+        """Upsert one request's worth of vectors, retrying transient failures."""
+        return _with_retry(self.index.upsert, vectors=vectors)
+    
+    def _query(self, **kwargs):
+        """Query the index, retrying transient failures."""
+        return _with_retry(self.index.query, **kwargs)
+    
+    def _get_cached_query(self, key: Tuple) -> Optional[List[Dict]]:
+        """Return a copy of a cached search result if it has not expired."""
+        with self._caches.lock:
+            cached = self._caches.queries.get(key)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[0] > QUERY_CACHE_TTL:
+                del self._caches.queries[key]
+                return None
+            self._caches.queries.move_to_end(key)
+            return [dict(match) for match in cached[1]]
+    
+    def _invalidate_caches(self):
+        """Drop cached search results and stats after the index changes."""
+        with self._caches.lock:
+            self._caches.queries.clear()
+            self._caches.stats = None
+    
+    def _format(self, results, score_threshold: float, include_values: bool) -> List[Dict]:
+        """Filter a query response by score threshold and convert matches to dicts."""
+        matches = []
+        for match in results.matches:
+            # Matches come back best first, so the rest are below the threshold too
+            if match.score < score_threshold:
+                break
+            entry = {
+                "id": match.id,
+                "score": match.score,
+                "metadata": match.metadata
+            }
+            if include_values:
+                entry["values"] = match.values
+            matches.append(entry)
+        return matches
     
     def delete_face(self, face_id: str) -> bool:
         """
@@ -143,58 +608,126 @@ class PineconeHelper:
         Returns:
             True if successful
         """
-        try:
-            self.index.delete(ids=[face_id])
-            return True
-        except Exception as e:
-            raise Exception(f"Failed to delete face: {str(e)}")
+        self.delete_faces([face_id])
+        return True
+    
+    def delete_faces(self, face_ids: List[str]) -> int:
+        """
+        Delete several faces using batched delete requests.
+        
+        Args:
+            face_ids: IDs of the faces to delete
+            
+        Returns:
+            Number of ids submitted for deletion
+        """
+        for i in range(0, len(face_ids), DELETE_BATCH_SIZE):
+            self.index.delete(ids=face_ids[i:i + DELETE_BATCH_SIZE])
+        if self._mirror is not None:
+            self._update_mirror("delete", list(face_ids))
+        with self._caches.lock:
+            self._caches.hot.delete_faces(face_ids)
+            for face_id in face_ids:
+                self._caches.hot_ids.pop(face_id, None)
+        self._invalidate_caches()
+        return len(face_ids)
     
     def get_stats(self) -> Dict:
         """
         Get index statistics.
         
+        Stats are cached for STATS_CACHE_TTL seconds so bursts of reads
+        (sidebar, home page, dashboards) share one request.
+        
         Returns:
             Dictionary with index stats
         """
+        with self._caches.lock:
+            cached = self._caches.stats
+        if cached is not None and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return dict(cached[1])
+        
+        stats = self.index.describe_index_stats()
+        result = {
+            "total_vectors": stats.total_vector_count,
+            "dimension": stats.dimension
+        }
+        with self._caches.lock:
+            self._caches.stats = (time.monotonic(), result)
+        return dict(result)
+    
+    def ping(self) -> bool:
+        """
+        Make a cheap request so the connection is open before a real query.
+        
+        Returns:
+            True if the index responded, False otherwise
+        """
         try:
-            stats = self.index.describe_index_stats()
-            return {
-                "total_vectors": stats.total_vector_count,
-                "dimension": stats.dimension
-            }
-        except Exception as e:
-            raise Exception(f"Failed to get stats: {str(e)}")
+            self.index.describe_index_stats()
+            return True
+        except Exception:
+            return False
     
-    def list_all_faces(self) -> List[Dict]:
+    def list_all_faces(self, include_values: bool = False) -> List[Dict]:
         """
         List all face entries in the index with their metadata.
 
+        Args:
+            include_values: Also return the stored embedding of each entry
+
         Returns:
-            List of dicts with id and metadata for each entry
+            List of dicts with id and metadata (plus values if requested) for each entry
         """
-        try:
-            all_ids = []
+        with ThreadPoolExecutor(max_workers=self.pool_threads) as executor:
+            # Fetch each page of ids while the next page is still being listed
+            futures = []
             for id_list in self.index.list():
-                all_ids.extend(id_list)
-
-            if not all_ids:
-                return []
+                for i in range(0, len(id_list), FETCH_BATCH_SIZE):
+                    futures.append(executor.submit(self.index.fetch, ids=id_list[i:i + FETCH_BATCH_SIZE]))
 
-            # Fetch metadata in batches of 100
             results = []
-            for i in range(0, len(all_ids), 100):
-                batch = all_ids[i:i + 100]
-                fetch_response = self.index.fetch(ids=batch)
-                for vid, vector_data in fetch_response.vectors.items():
-                    results.append({
+            for future in futures:
+                for vid, vector_data in future.result().vectors.items():
+                    entry = {
                         "id": vid,
                         "metadata": vector_data.metadata or {}
-                    })
+                    }
+                    if include_values:
+                        entry["values"] = vector_data.values
+                    results.append(entry)
 
-            return results
+        return results
 
-        except Exception as e:
-            raise Exception(f"Failed to list faces: {str(e)}")
+
+def _cosine_rescore(query: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Exact cosine similarity of each candidate row to the query in one matrix-vector product."""
+    norms = np.linalg.norm(candidates, axis=1) * np.linalg.norm(query)
+    return (candidates @ query) / np.where(norms > 0, norms, 1.0)
+
+
+def rerank_matches(query_embedding: Embedding, matches: List[Dict], top_k: int) -> List[Dict]:
+    """
+    Rerank over-fetched matches by exact cosine similarity to the query.
+    
+    Args:
+        query_embedding: Query face embedding
+        matches: Matches returned by search_faces with include_values=True
+        top_k: Number of matches to keep
+        
+    Returns:
+        Top matches ordered by exact score, with score replaced by it
+    """
+    if not matches:
+        return []
+    
+    scores = _cosine_rescore(
+        np.asarray(query_embedding, dtype=np.float32),
+        np.asarray([m["values"] for m in matches], dtype=np.float32)
+    )
+    
+    order = np.argsort(-scores)[:top_k]
+    return [{**matches[i], "score": float(scores[i])} for i in order]
 
 
 def initialize_pinecone_from_env() -> Optional[PineconeHelper]:
@@ -209,12 +742,18 @@ def initialize_pinecone_from_env() -> Optional[PineconeHelper]:
     
     api_key = os.getenv("PINECONE_API_KEY")
     index_name = os.getenv("PINECONE_INDEX_NAME", "face-recognition-index")
+    local_mirror = os.getenv("PINECONE_LOCAL_MIRROR", "").lower() in ("1", "true", "yes")
     
     if not api_key or api_key == "your_pinecone_api_key_here":
         return None
     
     try:
         # ArcFace uses 512-dimensional embeddings
-        return PineconeHelper(api_key=api_key, index_name=index_name, dimension=512)
+        return PineconeHelper(
+            api_key=api_key,
+            index_name=index_name,
+            dimension=512,
+            local_mirror=local_mirror
+        )
     except Exception as e:
         raise Exception(f"Failed to initialize Pinecone: {str(e)}")